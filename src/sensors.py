@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
+import os
 import re
 import time
-import pytz
+import select
+import fnmatch
+import threading
 import psutil
 import socket
 import platform
@@ -10,6 +13,12 @@ import subprocess
 import datetime as dt
 import sys
 
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    # Python < 3.9
+    from backports.zoneinfo import ZoneInfo
+
 # Only needed if using alternate method of obtaining CPU temperature (see commented out code for approach)
 #from os import walk
 
@@ -50,9 +59,20 @@ with open('/etc/os-release') as f:
         row = line.strip().split("=")
         OS_DATA[row[0]] = row[1].strip('"')
 
+# Pseudo/virtual filesystems never reported by mount discovery unless explicitly included
+PSEUDO_FSTYPES = {
+    'autofs', 'binfmt_misc', 'bpf', 'cgroup', 'cgroup2', 'configfs', 'debugfs',
+    'devpts', 'devtmpfs', 'efivarfs', 'fusectl', 'hugetlbfs', 'mqueue', 'nsfs',
+    'nfsd', 'overlay', 'proc', 'pstore', 'ramfs', 'rpc_pipefs', 'securityfs',
+    'selinuxfs', 'squashfs', 'sysfs', 'tmpfs', 'tracefs', 'fuse.gvfsd-fuse',
+    'fuse.lxcfs', 'fuse.portal', 'fuse.snapfuse',
+}
+MOUNTINFO_PATH = '/proc/self/mountinfo'
+STATVFS_TIMEOUT = 2.0
+
 old_net_data = psutil.net_io_counters()
 previous_time = time.time() - 10
-UTC = pytz.utc
+UTC = dt.timezone.utc
 DEFAULT_TIME_ZONE = None
 
 if not rpi_power_disabled:
@@ -60,6 +80,9 @@ if not rpi_power_disabled:
 
 def set_default_timezone(timezone):
     global DEFAULT_TIME_ZONE
+    # Resolve the zone once, so every tick reuses the same tzinfo object
+    if isinstance(timezone, str):
+        timezone = ZoneInfo(timezone)
     DEFAULT_TIME_ZONE = timezone
 
 def write_message_to_console(message):
@@ -67,24 +90,37 @@ def write_message_to_console(message):
     sys.stdout.flush()
 
 def as_local(dattim: dt.datetime) -> dt.datetime:
-    global DEFAULT_TIME_ZONE
     """Convert a UTC datetime object to local time zone."""
     if dattim.tzinfo == DEFAULT_TIME_ZONE:
         return dattim
     if dattim.tzinfo is None:
-        dattim = UTC.localize(dattim)
+        dattim = dattim.replace(tzinfo=UTC)
 
     return dattim.astimezone(DEFAULT_TIME_ZONE)
 
 def utc_from_timestamp(timestamp: float) -> dt.datetime:
     """Return a UTC time from a timestamp."""
-    return UTC.localize(dt.datetime.utcfromtimestamp(timestamp))
+    return dt.datetime.fromtimestamp(timestamp, UTC)
+
+def local_isoformat(timestamp: float) -> str:
+    """Return an ISO 8601 string in the local time zone for a timestamp."""
+    if DEFAULT_TIME_ZONE is None:
+        return utc_from_timestamp(timestamp).astimezone().isoformat()
+    # Single conversion straight into the cached zone, no intermediate UTC datetime
+    return dt.datetime.fromtimestamp(timestamp, DEFAULT_TIME_ZONE).isoformat()
 
+@static_vars(boot_time=None, time_zone=None, last_boot=None)
 def get_last_boot():
-    return str(as_local(utc_from_timestamp(psutil.boot_time())).isoformat())
+    # Boot time does not change while running, only reformat when it (or the zone) does
+    boot_time = psutil.boot_time()
+    if boot_time != get_last_boot.boot_time or DEFAULT_TIME_ZONE is not get_last_boot.time_zone:
+        get_last_boot.boot_time = boot_time
+        get_last_boot.time_zone = DEFAULT_TIME_ZONE
+        get_last_boot.last_boot = local_isoformat(boot_time)
+    return get_last_boot.last_boot
 
 def get_last_message():
-    return str(as_local(utc_from_timestamp(time.time())).isoformat())
+    return local_isoformat(time.time())
 
 
 @static_vars(last_update_check=dt.datetime.min, available_updates=0)
@@ -140,13 +176,188 @@ def get_clock_speed():
     clock_speed = int(psutil.cpu_freq().current)
     return clock_speed
 
-def get_disk_usage(path):
+def set_statvfs_timeout(timeout):
+    global STATVFS_TIMEOUT
+    STATVFS_TIMEOUT = float(timeout)
+
+def _unescape_mount_field(field):
+    # mountinfo escapes space, tab, newline and backslash as octal (e.g. \040)
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), field)
+
+def parse_mountinfo(lines) -> dict:
+    """Parse mountinfo lines into {mount_point: (fstype, source)}."""
+    mounts = {}
+    for line in lines:
+        fields = line.split()
+        try:
+            separator = fields.index('-')
+            mount_point = _unescape_mount_field(fields[4])
+            fstype = fields[separator + 1]
+            source = _unescape_mount_field(fields[separator + 2])
+        except (ValueError, IndexError):
+            continue
+        # Later entries overmount earlier ones on the same path
+        mounts[mount_point] = (fstype, source)
+    return mounts
+
+@static_vars(file=None, poller=None, mounts={}, version=0)
+def get_mount_index():
+    """Return (version, {mount_point: (fstype, source)}), re-reading mountinfo only when it changed.
+
+    The kernel flags /proc/self/mountinfo with POLLPRI whenever the mount table changes,
+    so the file is kept open and polled instead of being parsed on every tick.
+    """
+    index = get_mount_index
+    changed = index.file is None
+    if index.file is None:
+        try:
+            index.file = open(MOUNTINFO_PATH)
+            index.poller = select.poll()
+            index.poller.register(index.file, select.POLLPRI | select.POLLERR)
+        except (OSError, AttributeError):
+            index.poller = None
+    elif index.poller is None:
+        changed = True  # No poll support, fall back to re-reading every call
+    else:
+        changed = bool(index.poller.poll(0))
+
+    if changed:
+        try:
+            index.file.seek(0)
+            mounts = parse_mountinfo(index.file.read().splitlines())
+        except (OSError, ValueError, AttributeError) as e:
+            print('Error while reading ' + MOUNTINFO_PATH + ' with exception: ' + str(e))
+            mounts = index.mounts
+        if mounts != index.mounts:
+            index.mounts = mounts
+            index.version += 1
+    return index.version, index.mounts
+
+def discover_mounts(include_fstypes=None, exclude_fstypes=None, include_paths=None, exclude_paths=None) -> dict:
+    """Return {mount_point: fstype} for the mounts passing the fstype and path (glob) filters.
+
+    Without include_fstypes every filesystem except PSEUDO_FSTYPES and exclude_fstypes is kept.
+    """
+    _, mounts = get_mount_index()
+    discovered = {}
+    for mount_point, (fstype, _source) in mounts.items():
+        if include_fstypes:
+            if fstype not in include_fstypes:
+                continue
+        elif fstype in PSEUDO_FSTYPES:
+            continue
+        if exclude_fstypes and fstype in exclude_fstypes:
+            continue
+        if include_paths and not any(fnmatch.fnmatch(mount_point, p) for p in include_paths):
+            continue
+        if exclude_paths and any(fnmatch.fnmatch(mount_point, p) for p in exclude_paths):
+            continue
+        # Skip file bind mounts, e.g. /etc/hosts and /etc/resolv.conf in containers.
+        # A mount that does not answer in time is kept, it reports no value until it does.
+        try:
+            if not call_with_timeout(f'isdir {mount_point}', os.path.isdir, mount_point):
+                continue
+        except TimeoutError as e:
+            print('Could not check mount ' + mount_point + ': ' + str(e))
+        discovered[mount_point] = fstype
+    return discovered
+
+@static_vars(pending={})
+def call_with_timeout(name, func, *args):
+    """Run func(*args) in a worker thread and return its result, so a stale network
+    mount cannot hang the tick. Raises TimeoutError after STATVFS_TIMEOUT seconds.
+
+    While a previous call with the same name is still blocked no new thread is started.
+    """
+    pending = call_with_timeout.pending
+    # Forget workers that returned in the meantime, e.g. for mounts that are gone
+    for key in [key for key, worker in pending.items() if not worker.is_alive()]:
+        del pending[key]
+    if name in pending:
+        raise TimeoutError(f'{name} still blocked from a previous call')
+
+    result = {}
+    def run():
+        try:
+            result['value'] = func(*args)
+        except Exception as e:
+            result['error'] = e
+
+    worker = threading.Thread(target=run, name=name, daemon=True)
+    worker.start()
+    worker.join(STATVFS_TIMEOUT)
+    if worker.is_alive():
+        pending[name] = worker
+        raise TimeoutError(f'{name} did not return within {STATVFS_TIMEOUT} seconds')
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+def _realpath_statvfs(path):
+    real_path = os.path.realpath(path)
+    return real_path, os.statvfs(real_path)
+
+@static_vars(cache={})
+def statvfs_with_timeout(path):
+    """Return (realpath, os.statvfs()) for path, see call_with_timeout().
+
+    Results are kept until reset_statvfs_cache() is called at the start of the next
+    tick, since the usage, free space and inode sensors of a mount share one call.
+    """
+    cache = statvfs_with_timeout.cache
+    if path not in cache:
+        cache[path] = call_with_timeout(f'statvfs {path}', _realpath_statvfs, path)
+    return cache[path]
+
+def reset_statvfs_cache():
+    statvfs_with_timeout.cache.clear()
+
+@static_vars(problems={})
+def _get_mounted_statvfs(path, require_mount=True):
+    """statvfs for path, or None if it failed or path is not a mount point.
+
+    With require_mount=False a plain directory (e.g. on /) is reported as well.
+    Problems are logged once per change, not on every tick for every sensor.
+    """
+    problems = _get_mounted_statvfs.problems
     try:
-        disk_percentage = str(psutil.disk_usage(path).percent)
-        return disk_percentage
+        real_path, st = statvfs_with_timeout(path)
     except Exception as e:
-        print('Error while trying to obtain disk usage from ' + str(path) + ' with exception: ' + str(e))
+        problem = 'Error while trying to obtain disk info from ' + str(path) + ' with exception: ' + str(e)
+    else:
+        _, mounts = get_mount_index()
+        if not require_mount or real_path in mounts:
+            if path in problems:
+                del problems[path]
+                print(str(path) + ' is available again')
+            return st
+        problem = str(path) + ' is not mounted to host, reporting no value until it is mounted'
+
+    if problems.get(path) != problem:
+        problems[path] = problem
+        print(problem)
+    return None
+
+def get_disk_usage(path, require_mount=True):
+    st = _get_mounted_statvfs(path, require_mount)
+    if st is None:
         return None # Changed to return None for handling exception at function call location
+    # Same calculation as psutil.disk_usage(): percentage of the space available to non-root users
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    total_user = used + st.f_bavail * st.f_frsize
+    return str(round(used / total_user * 100, 1) if total_user else 0.0)
+
+def get_disk_free(path, require_mount=True):
+    st = _get_mounted_statvfs(path, require_mount)
+    if st is None:
+        return None
+    return str(round(st.f_bavail * st.f_frsize / 1024 / 1024 / 1024, 2))
+
+def get_disk_inodes_free(path, require_mount=True):
+    st = _get_mounted_statvfs(path, require_mount)
+    if st is None:
+        return None
+    return str(st.f_favail)
 
 def get_memory_usage():
     return str(psutil.virtual_memory().percent)
@@ -233,13 +444,31 @@ def get_host_arch():
         return 'Unknown'
 
 # Builds an external drive entry to fix incorrect usage reporting
-def external_drive_base(drive, drive_path) -> dict:
+def external_drive_base(drive, drive_path, require_mount=True) -> dict:
     return {
         'name': f'Disk Use {drive}',
         'unit': '%',
         'icon': 'harddisk',
         'sensor_type': 'sensor',
-        'function': lambda: get_disk_usage(f'{drive_path}')
+        'function': lambda: get_disk_usage(f'{drive_path}', require_mount)
+        }
+
+def external_drive_free_config(drive, drive_path, require_mount=True) -> dict:
+    return {
+        'name': f'Disk Free {drive}',
+        'unit': 'GiB',
+        'icon': 'harddisk',
+        'sensor_type': 'sensor',
+        'function': lambda: get_disk_free(f'{drive_path}', require_mount)
+        }
+
+def external_drive_inodes_free_config(drive, drive_path, require_mount=True) -> dict:
+    return {
+        'name': f'Inodes Free {drive}',
+        'unit': u"\u200B", # dummy unit (zero whitespace) to display graph
+        'icon': 'harddisk',
+        'sensor_type': 'sensor',
+        'function': lambda: get_disk_inodes_free(f'{drive_path}', require_mount)
         }
 
 def smartctl_disk_temp_config(disk, disk_path) -> dict:
@@ -294,6 +523,18 @@ sensors = {
                  'icon': 'micro-sd',
                  'sensor_type': 'sensor',
                  'function': lambda: get_disk_usage('/')},
+          'disk_free':
+                {'name':'Disk Free',
+                 'unit': 'GiB',
+                 'icon': 'micro-sd',
+                 'sensor_type': 'sensor',
+                 'function': lambda: get_disk_free('/')},
+          'disk_inodes_free':
+                {'name':'Disk Inodes Free',
+                 'unit': u"\u200B", # dummy unit (zero whitespace) to display graph
+                 'icon': 'micro-sd',
+                 'sensor_type': 'sensor',
+                 'function': lambda: get_disk_inodes_free('/')},
           'memory_use':
                 {'name':'Memory Use',
                  'unit': '%',
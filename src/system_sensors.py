@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from os import error, path
+import re
 import sys
 import time
 import yaml
@@ -20,6 +21,8 @@ devicename = None
 settings = {}
 external_drives = []
 smartctl_disks = []
+discovered_mounts = {}
+mount_index_version = None
 
 class ProgramKilled(Exception):
     pass
@@ -51,8 +54,15 @@ class Job(threading.Thread):
 
 
 def update_sensors():
+    reset_statvfs_cache()
+    # Pick up drives mounted after startup
+    try:
+        if add_mounts():
+            send_config_message(mqttClient)
+    except:
+        traceback.print_exc()
     payload_str = f'{{'
-    for sensor, attr in sensors.items():
+    for sensor, attr in list(sensors.items()):
         # Skip sensors that have been disabled or are missing
         if sensor in external_drives or sensor in smartctl_disks or (settings['sensors'][sensor] is not None and settings['sensors'][sensor] == True):
             try:
@@ -84,7 +94,7 @@ def send_config_message(mqttClient):
 
     write_message_to_console('Sending config message to host...')     
 
-    for sensor, attr in sensors.items():
+    for sensor, attr in list(sensors.items()):
         try:
             # Added check in case sensor is an external drive, which is nested in the config
             if sensor in external_drives or sensor in smartctl_disks or settings['sensors'][sensor]:
@@ -122,7 +132,7 @@ def _parser():
 
 def set_defaults(settings):
     global poll_interval
-    set_default_timezone(pytz.timezone(settings['timezone']))
+    set_default_timezone(settings['timezone'])
     poll_interval = settings['update_interval'] if 'update_interval' in settings else 60
     if 'port' not in settings['mqtt']:
         settings['mqtt']['port'] = 1883
@@ -135,6 +145,16 @@ def set_defaults(settings):
         settings['sensors']['external_drives'] = {}
     if 'smartctl_disks' not in settings['sensors'] or settings['sensors']['smartctl_disks'] is None:
         settings['sensors']['smartctl_disks'] = {}
+    if 'mounts' not in settings['sensors'] or settings['sensors']['mounts'] is None:
+        settings['sensors']['mounts'] = {}
+    mounts = settings['sensors']['mounts']
+    mounts.setdefault('discover', False)
+    for mount_filter in ['include_fstypes', 'exclude_fstypes', 'include_paths', 'exclude_paths']:
+        if mount_filter not in mounts or mounts[mount_filter] is None:
+            mounts[mount_filter] = []
+    if 'timeout' not in mounts or mounts['timeout'] is None:
+        mounts['timeout'] = STATVFS_TIMEOUT
+    set_statvfs_timeout(mounts['timeout'])
 
     # 'settings' argument is local, so needs to be returned to overwrite the one in the main function
     return settings
@@ -163,19 +183,65 @@ def check_settings(settings):
     if 'power_integer_state' in settings:
         write_message_to_console('power_integer_state is deprecated please remove this option power state is now a binary_sensor!')
 
+def add_drive_sensors(base_name, drive, drive_path, require_mount=True):
+    name = base_name
+    # Different drives can end up with the same key, never overwrite an existing sensor
+    suffix = 2
+    while f'disk_use_{name}' in sensors or f'disk_free_{name}' in sensors or f'disk_inodes_free_{name}' in sensors:
+        name = f'{base_name}_{suffix}'
+        suffix += 1
+    if name != base_name:
+        write_message_to_console(f'Sensor name disk_use_{base_name} already in use, using disk_use_{name} for {drive_path}')
+    sensors[f'disk_use_{name}'] = external_drive_base(drive, drive_path, require_mount)
+    sensors[f'disk_free_{name}'] = external_drive_free_config(drive, drive_path, require_mount)
+    sensors[f'disk_inodes_free_{name}'] = external_drive_inodes_free_config(drive, drive_path, require_mount)
+    # Add drive to list with formatted name, for when checking sensors against settings items
+    external_drives.extend([f'disk_use_{name}', f'disk_free_{name}', f'disk_inodes_free_{name}'])
+
+def external_drive_settings(drive_settings):
+    """Return (path, require_mount) for an external_drives entry, either a path or
+    a mapping with 'path' and optional 'require_mount' (defaults to True)."""
+    if isinstance(drive_settings, dict):
+        require_mount = drive_settings.get('require_mount')
+        return str(drive_settings['path']), require_mount is None or bool(require_mount)
+    return str(drive_settings), True
+
 def add_drives():
     drives = settings['sensors']['external_drives']
     if drives is not None:
         for drive in drives:
-            drive_path = settings['sensors']['external_drives'][drive]
-            usage = get_disk_usage(drive_path)
-            if usage:
-                sensors[f'disk_use_{drive.lower()}'] = external_drive_base(drive, drives[drive])
-                # Add drive to list with formatted name, for when checking sensors against settings items
-                external_drives.append(f'disk_use_{drive.lower()}')
-            else:
-                # Skip drives not found. Could be worth sending "not mounted" as the value if users want to track mount status.
-                print(drive + ' is not mounted to host. Check config or host drive mount settings.')
+            drive_path, require_mount = external_drive_settings(settings['sensors']['external_drives'][drive])
+            # Register unavailable drives as well, they report None until mounted
+            if get_disk_usage(drive_path, require_mount) is None:
+                print(drive + ' is not available on host. Check config or host drive mount settings.')
+            # Keep the original key, it is part of the unique_id in Home Assistant
+            add_drive_sensors(drive.lower(), drive, drive_path, require_mount)
+
+def add_mounts():
+    """Add sensors for newly discovered mounts, returns True if any were added."""
+    global mount_index_version
+    mounts = settings['sensors']['mounts']
+    if not mounts['discover']:
+        return False
+    # Only filter the mount table again when mountinfo has changed
+    version, _ = get_mount_index()
+    if version == mount_index_version:
+        return False
+    mount_index_version = version
+
+    configured_paths = [path.normpath(external_drive_settings(d)[0]) for d in settings['sensors']['external_drives'].values()]
+    added = False
+    for mount_point in discover_mounts(mounts['include_fstypes'], mounts['exclude_fstypes'],
+                                       mounts['include_paths'], mounts['exclude_paths']):
+        # / is covered by disk_use, configured drives by add_drives()
+        if mount_point == '/' or mount_point in configured_paths or mount_point in discovered_mounts:
+            continue
+        drive = mount_point.strip('/')
+        discovered_mounts[mount_point] = drive
+        add_drive_sensors(re.sub(r'[^a-z0-9_]', '_', drive.lower()), drive, mount_point)
+        write_message_to_console('Discovered mount ' + mount_point)
+        added = True
+    return added
 
 def add_smartctl_disks():
     disks = settings['sensors']['smartctl_disks']
@@ -233,6 +299,7 @@ if __name__ == '__main__':
     check_settings(settings)
     
     add_drives()
+    add_mounts()
     add_smartctl_disks()
 
     devicename = settings['devicename'].replace(' ', '').lower()